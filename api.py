@@ -1,6 +1,7 @@
 from flask import Flask, request, jsonify
-from flasgger import Swagger
 import sqlite3
+import threading
+from weather_partitions import find_partitions, query_weather_partitions, MissingPartitionError
 
 
 app = Flask(__name__)
@@ -29,7 +30,36 @@ swagger_template = {
     }
 }
 
-swagger = Swagger(app, config=swagger_config, template=swagger_template)
+# Swagger docs are built lazily so importing this module (and cold starting a
+# worker) does not pay for flasgger until the docs are actually requested
+DOCS_PATH_PREFIXES = ('/apidocs', '/flasgger_static')
+_swagger = None
+_swagger_lock = threading.Lock()
+
+# Creates the flasgger Swagger object on first use. It is bound to a separate
+# docs app because Flask does not allow new routes once requests are served.
+def get_swagger():
+    global _swagger
+    with _swagger_lock:
+        if _swagger is None:
+            from flasgger import Swagger
+            docs_app = Flask(__name__)
+            _swagger = Swagger(docs_app, config=swagger_config, template=swagger_template)
+        # flasgger skips its spec cache in debug mode, so follow the API app's setting
+        _swagger.app.debug = app.debug
+    return _swagger
+
+# Sends Swagger UI and static requests to the docs app, everything else to the API
+class LazyDocsMiddleware:
+    def __init__(self, api_wsgi_app):
+        self.api_wsgi_app = api_wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO', '').startswith(DOCS_PATH_PREFIXES):
+            return get_swagger().app.wsgi_app(environ, start_response)
+        return self.api_wsgi_app(environ, start_response)
+
+app.wsgi_app = LazyDocsMiddleware(app.wsgi_app)
 
 # Database configuration
 DATABASE = 'weather.db'
@@ -40,6 +70,13 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row  # Allows access columns by name
     return conn
 
+# Creates the Swagger spec from this app's routes on first hit (cached by flasgger).
+# This relies on flasgger 0.9.7.1 (pinned in requirements.txt) reading the routes
+# from current_app, which is this app here, rather than from swagger.app.
+@app.route('/apispec.json')
+def apispec():
+    return jsonify(get_swagger().get_apispecs('apispec'))
+
 # Creates the home API message
 @app.route('/')
 def home():
@@ -107,15 +144,26 @@ def get_weather():
         where_clause += ' AND date = ?'
         params.append(date)
     
-    # Get total count for pagination metadata
-    count_query = f'SELECT COUNT(*) FROM weather WHERE {where_clause}'
-    cur.execute(count_query, params)
-    total_records = cur.fetchone()[0]
-    
-    # Get paginated data
-    data_query = f'SELECT * FROM weather WHERE {where_clause} LIMIT ? OFFSET ?'
-    cur.execute(data_query, params + [per_page, offset])
-    rows = cur.fetchall()
+    # Route to the partitions overlapping the filters if the db is partitioned
+    partitions = find_partitions(conn, DATABASE, station, date)
+
+    if partitions is not None:
+        try:
+            total_records, rows = query_weather_partitions(conn, partitions, where_clause, params, per_page, offset)
+        except MissingPartitionError as e:
+            # A partition file was deleted or a rebuild didn't finish
+            conn.close()
+            return jsonify({'error': str(e)}), 503
+    else:
+        # Get total count for pagination metadata
+        count_query = f'SELECT COUNT(*) FROM weather WHERE {where_clause}'
+        cur.execute(count_query, params)
+        total_records = cur.fetchone()[0]
+
+        # Get paginated data
+        data_query = f'SELECT * FROM weather WHERE {where_clause} LIMIT ? OFFSET ?'
+        cur.execute(data_query, params + [per_page, offset])
+        rows = cur.fetchall()
     
     # Convert rows to list of dictionaries
     results = []
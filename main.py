@@ -9,23 +9,24 @@ import sqlite3
 import os
 from pathlib import Path
 import time
-from tqdm import tqdm
-import pandas as pd
-import numpy as np
 import logging
+import argparse
 from weather_utils import load_all_weather_files, Timer
+from weather_partitions import PARTITION_MODES, partition_weather_table, drop_catalog_tables
 
-# Configure logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('weather_ingestion.log'),
-        logging.StreamHandler()  # Also prints to console
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Configure logging setup (called from main so importing this module doesn't create the log file)
+def configure_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('weather_ingestion.log'),
+            logging.StreamHandler()  # Also prints to console
+        ]
+    )
+
 # Table creation definitions (3)
 def create_weather_table(cursor):
     cursor.execute('DROP TABLE IF EXISTS weather')
@@ -61,7 +62,13 @@ def create_yield_table(cursor):
         )
     ''')
 
-def main():
+def main(partition_mode=None):
+    configure_logging()
+
+    # Heavy dependencies are only imported when ingestion actually runs
+    import pandas as pd
+    import numpy as np
+
     # Configuration
     db_path = 'weather.db'
     data_directory = 'wx_data'
@@ -79,6 +86,7 @@ def main():
     create_weather_table(cur)
     create_yearly_table(cur)
     create_yield_table(cur)
+    drop_catalog_tables(cur, db_path)  # Also removes old partition files; rebuilt below if partitioning
     
     # Load data
     load_all_weather_files(data_directory, cur)
@@ -133,14 +141,21 @@ def main():
     # Commit db
     conn.commit()
 
+    # To see how many records are in the weather table (before it gets partitioned)
+    cur.execute('SELECT COUNT(*) FROM weather')
+    count0 = cur.fetchone()[0]
+
+    # Optionally split the weather table into one db file per partition plus a catalog
+    if partition_mode:
+        num_partitions = partition_weather_table(conn, db_path, partition_mode)
+        logger.info(f"Weather table split into {num_partitions} {partition_mode} partitions.")
+
     # Timer completion
     logger.info("Data successfully imported into weather, yearly, and yield SQLite tables.")
     elapsed = t.stop()
     logger.info(f"Elapsed processing time: {elapsed:.6f} seconds")
     
     # To see how many records are in each table
-    cur.execute('SELECT COUNT(*) FROM weather')
-    count0 = cur.fetchone()[0]
     logger.info(f"\nTotal records in the weather station table: {count0}")
 
     cur.execute('SELECT COUNT(*) FROM weather_yearly')
@@ -155,5 +170,9 @@ def main():
     conn.close()
     
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Load weather and crop yield data into SQLite.')
+    parser.add_argument('--partition', choices=PARTITION_MODES, default=None,
+                        help='Write the weather table as one db file per decade or per state')
+    args = parser.parse_args()
+    main(partition_mode=args.partition)
 
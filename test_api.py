@@ -54,4 +54,11 @@ def test_weather_stats_endpoint_year_filter(client):
 # Tests Swagger documentation is available
 def test_swagger_endpoint_available(client):
     response = client.get('/apidocs/')
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+# Tests the Swagger spec is generated from the API routes
+def test_swagger_spec_available(client):
+    response = client.get('/apispec.json')
+    assert response.status_code == 200
+    assert response.json['info']['title'] == 'Weather API'
+    assert '/api/weather' in response.json['paths']
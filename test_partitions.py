@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import pytest
+import api
+from weather_partitions import (
+    partition_key,
+    partition_path,
+    partition_weather_table,
+    find_partitions,
+    query_weather_partitions,
+    drop_catalog_tables,
+    MissingPartitionError
+)
+
+# Weather records spread over two decades and two states
+RECORDS = [
+    ('USC00110072', 19891231, -6, -83, 160),
+    ('USC00110072', 19900101, -50, -206, 0),
+    ('USC00110072', 19900102, 10, -20, 5),
+    ('USC00130112', 19850101, 20, -10, 0),
+    ('USC00130112', 19950101, 30, 0, 12),
+]
+
+@pytest.fixture
+# Creates a weather db with the records above, in the main.py layout
+def weather_db(tmp_path):
+    db_path = str(tmp_path / 'weather.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE weather (
+            station TEXT,
+            date DATE,
+            max_temp INTEGER,
+            min_temp INTEGER,
+            precipitation INTEGER,
+            PRIMARY KEY (station, date)
+        )
+    ''')
+    conn.executemany('INSERT INTO weather VALUES (?, ?, ?, ?, ?)', RECORDS)
+    conn.commit()
+    yield conn, db_path
+    conn.close()
+
+# Tests partition names for each mode
+def test_partition_key():
+    assert partition_key('USC00110072', 19891231, 'decade') == 'decade_1980'
+    assert partition_key('USC00110072', '19900101', 'decade') == 'decade_1990'
+    assert partition_key('USC00110072', 19900101, 'state') == 'state_USC0011'
+
+def test_partition_key_unknown_mode():
+    with pytest.raises(ValueError):
+        partition_key('USC00110072', 19900101, 'month')
+
+def test_partition_path():
+    assert partition_path('data/weather.db', 'decade_1980') == 'data/weather_decade_1980.db'
+
+# Tests partitioning writes one file per decade and moves the weather table out
+def test_partition_weather_table_by_decade(weather_db):
+    conn, db_path = weather_db
+    assert partition_weather_table(conn, db_path, 'decade') == 2
+
+    for name in ('decade_1980', 'decade_1990'):
+        assert os.path.exists(partition_path(db_path, name))
+
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'weather'")
+    assert cur.fetchone()[0] == 0
+    cur.execute('SELECT SUM(record_count) FROM weather_partitions')
+    assert cur.fetchone()[0] == len(RECORDS)
+
+# Tests the router only picks partitions overlapping the filters
+def test_find_partitions_routes_by_filters(weather_db):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'decade')
+
+    names = lambda partitions: [name for name, _ in partitions]
+    assert names(find_partitions(conn, db_path)) == ['decade_1980', 'decade_1990']
+    assert names(find_partitions(conn, db_path, date='19900101')) == ['decade_1990']
+    assert names(find_partitions(conn, db_path, station='USC00130112', date='19850101')) == ['decade_1980']
+    assert find_partitions(conn, db_path, date='20200101') == []
+
+def test_find_partitions_unpartitioned(weather_db):
+    conn, db_path = weather_db
+    assert find_partitions(conn, db_path) is None
+
+# Tests pagination across partitions returns every record exactly once
+def test_query_weather_partitions_pagination(weather_db):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'state')
+    partitions = find_partitions(conn, db_path)
+
+    seen = []
+    for offset in range(0, len(RECORDS), 2):
+        total, rows = query_weather_partitions(conn, partitions, '1=1', [], 2, offset)
+        assert total == len(RECORDS)
+        seen.extend(rows)
+    assert sorted(seen) == sorted(RECORDS)
+
+# Tests the weather endpoint works against a partitioned db
+def test_weather_endpoint_partitioned(weather_db, monkeypatch):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'decade')
+    monkeypatch.setattr(api, 'DATABASE', db_path)
+
+    client = api.app.test_client()
+    response = client.get('/api/weather?station=USC00110072&per_page=2&page=2')
+    assert response.status_code == 200
+    assert response.json['pagination']['total_records'] == 3
+    assert [record['date'] for record in response.json['data']] == [19900102]
+
+# Tests the SQL partition names match partition_key
+def test_partition_names_match_partition_key(weather_db):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'state')
+    cur = conn.cursor()
+    cur.execute('SELECT name FROM weather_partitions ORDER BY name')
+    expected = sorted({partition_key(record[0], record[1], 'state') for record in RECORDS})
+    assert [row[0] for row in cur.fetchall()] == expected
+
+# Tests a missing partition file gives a clear error and isn't recreated empty
+def test_query_weather_partitions_missing_file(weather_db):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'decade')
+    missing_path = partition_path(db_path, 'decade_1990')
+    os.remove(missing_path)
+
+    with pytest.raises(MissingPartitionError):
+        query_weather_partitions(conn, find_partitions(conn, db_path), '1=1', [], 10, 0)
+    assert not os.path.exists(missing_path)
+
+def test_weather_endpoint_missing_partition(weather_db, monkeypatch):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'decade')
+    os.remove(partition_path(db_path, 'decade_1990'))
+    monkeypatch.setattr(api, 'DATABASE', db_path)
+
+    response = api.app.test_client().get('/api/weather')
+    assert response.status_code == 503
+    assert 'decade_1990' in response.json['error']
+    assert not os.path.exists(partition_path(db_path, 'decade_1990'))
+
+# Tests dropping the catalog also deletes the old partition files
+def test_drop_catalog_tables_removes_partition_files(weather_db):
+    conn, db_path = weather_db
+    partition_weather_table(conn, db_path, 'decade')
+    cur = conn.cursor()
+    drop_catalog_tables(cur, db_path)
+    conn.commit()
+
+    assert not os.path.exists(partition_path(db_path, 'decade_1980'))
+    assert not os.path.exists(partition_path(db_path, 'decade_1990'))
+    assert find_partitions(conn, db_path) is None
+
+# Tests a date outside its decade's range is kept in the single table instead of dropped
+def test_partition_weather_table_out_of_range_date(weather_db):
+    conn, db_path = weather_db
+    conn.execute("INSERT INTO weather VALUES ('USC00110072', 'bad-date', 0, 0, 0)")
+    conn.commit()
+
+    with pytest.raises(ValueError):
+        partition_weather_table(conn, db_path, 'decade')
+
+    cur = conn.cursor()
+    cur.execute('SELECT COUNT(*) FROM weather')
+    assert cur.fetchone()[0] == len(RECORDS) + 1
+    assert find_partitions(conn, db_path) is None
+    assert not os.path.exists(partition_path(db_path, 'decade_1980'))
+
+# Tests dates that don't exist on the calendar still land in their decade
+def test_partition_weather_table_invalid_calendar_dates(weather_db):
+    conn, db_path = weather_db
+    conn.executemany(
+        "INSERT INTO weather VALUES ('USC00110072', ?, 0, 0, 0)",
+        [(19891301,), (19850000,)]
+    )
+    conn.commit()
+
+    partition_weather_table(conn, db_path, 'decade')
+    cur = conn.cursor()
+    cur.execute('SELECT SUM(record_count) FROM weather_partitions')
+    assert cur.fetchone()[0] == len(RECORDS) + 2
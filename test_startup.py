@@ -0,0 +1,74 @@
+import subprocess
+import sys
+import os
+import pytest
+
+# Wall-clock budgets are noisy on busy machines, so they only run when asked:
+# RUN_STARTUP_BENCHMARK=1 pytest test_startup.py
+run_benchmark = pytest.mark.skipif(
+    not os.environ.get('RUN_STARTUP_BENCHMARK'),
+    reason='set RUN_STARTUP_BENCHMARK=1 to run the cold start timing budgets'
+)
+
+# Cold start budgets in seconds for importing each module in a fresh interpreter.
+# The api budget is on top of a bare `import flask` measured in the same run so it
+# doesn't depend on the machine; eagerly importing flasgger adds well over 0.1s.
+API_IMPORT_OVERHEAD_BUDGET = 0.075
+MAIN_IMPORT_BUDGET = 0.15
+
+# Number of cold starts to run, the fastest one is compared to the budget
+RUNS = 3
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Imports a module in a fresh interpreter and returns the import time and loaded modules
+def cold_import(module):
+    code = (
+        'import sys, time\n'
+        't = time.perf_counter()\n'
+        f'import {module}\n'
+        'print(time.perf_counter() - t)\n'
+        'print(",".join(sys.modules))\n'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    elapsed, modules = result.stdout.strip().split('\n')
+    return float(elapsed), set(modules.split(','))
+
+# Returns the fastest cold import time over several runs
+def best_import_time(module):
+    return min(cold_import(module)[0] for _ in range(RUNS))
+
+# Tests importing the API does not load flasgger until the docs are requested
+def test_api_import_is_lazy():
+    _, modules = cold_import('api')
+    assert 'flasgger' not in modules
+    assert 'pandas' not in modules
+
+# Tests importing the ingestion script does not load pandas, numpy or tqdm
+def test_main_import_is_lazy():
+    _, modules = cold_import('main')
+    assert 'pandas' not in modules
+    assert 'numpy' not in modules
+    assert 'tqdm' not in modules
+
+# Tests the API cold start stays within budget of a bare Flask import
+@run_benchmark
+def test_api_import_time_budget():
+    flask_elapsed = best_import_time('flask')
+    elapsed = best_import_time('api')
+    overhead = elapsed - flask_elapsed
+    assert overhead < API_IMPORT_OVERHEAD_BUDGET, (
+        f"api import took {elapsed:.3f}s, {overhead:.3f}s over flask (budget {API_IMPORT_OVERHEAD_BUDGET}s)"
+    )
+
+# Tests the ingestion script cold start stays within budget
+@run_benchmark
+def test_main_import_time_budget():
+    elapsed = best_import_time('main')
+    assert elapsed < MAIN_IMPORT_BUDGET, f"main import took {elapsed:.3f}s (budget {MAIN_IMPORT_BUDGET}s)"
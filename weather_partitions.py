@@ -0,0 +1,217 @@
+import os
+
+# Supported partition layouts for the weather table
+PARTITION_MODES = ('decade', 'state')
+
+# Catalog tables (live in the main db next to weather_yearly and crop_yields)
+CATALOG_TABLE = 'weather_partitions'
+CATALOG_STATIONS_TABLE = 'weather_partition_stations'
+
+# SQL expressions giving each weather row's partition name (same names as partition_key)
+PARTITION_KEY_SQL = {
+    'decade': "'decade_' || (CAST(date AS INTEGER) / 100000 * 10)",
+    'state': "'state_' || substr(station, 1, 7)",
+}
+
+# Raised when the catalog lists a partition file that is not on disk
+class MissingPartitionError(FileNotFoundError):
+    pass
+
+# Returns the partition name a weather record belongs to
+def partition_key(station, date, mode):
+    if mode == 'decade':
+        return f"decade_{int(date) // 100000 * 10}"
+    if mode == 'state':
+        # USC00 + 2 digit state code, e.g. USC0011 for Illinois
+        return f"state_{station[:7]}"
+    raise ValueError(f"Unknown partition mode: {mode}")
+
+# Partition file path next to the main db, e.g. weather_decade_1980.db
+def partition_path(db_path, name):
+    stem, ext = os.path.splitext(db_path)
+    return f"{stem}_{name}{ext or '.db'}"
+
+# WHERE clause selecting one partition's rows, using the same bounds as
+# PARTITION_KEY_SQL. Decade ranges scan the table; the state prefix range can
+# use the (station, date) primary key.
+def partition_filter(name, mode):
+    value = name.split('_', 1)[1]
+    if mode == 'decade':
+        decade = int(value)
+        return 'date >= ? AND date < ?', [decade * 10000, (decade + 10) * 10000]
+    if mode == 'state':
+        # Every station starting with the prefix sorts between these two strings
+        return 'station >= ? AND station < ?', [value, value + '\uffff']
+    raise ValueError(f"Unknown partition mode: {mode}")
+
+# Returns True if the db has a partition catalog
+def has_catalog(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [CATALOG_TABLE])
+    return cursor.fetchone() is not None
+
+# Removes the catalog and the partition files it lists, so the API goes back
+# to the single weather table
+def drop_catalog_tables(cursor, db_path):
+    if has_catalog(cursor):
+        cursor.execute(f'SELECT path FROM {CATALOG_TABLE}')
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        for (path,) in cursor.fetchall():
+            path = os.path.join(db_dir, path)
+            if os.path.exists(path):
+                os.remove(path)
+    cursor.execute(f'DROP TABLE IF EXISTS {CATALOG_TABLE}')
+    cursor.execute(f'DROP TABLE IF EXISTS {CATALOG_STATIONS_TABLE}')
+
+# Creates the catalog tables used by the query router
+def create_catalog_tables(cursor):
+    cursor.execute(f'''
+        CREATE TABLE {CATALOG_TABLE} (
+            name TEXT PRIMARY KEY,
+            path TEXT,
+            min_date INTEGER,
+            max_date INTEGER,
+            record_count INTEGER
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE {CATALOG_STATIONS_TABLE} (
+            station TEXT,
+            name TEXT,
+            PRIMARY KEY (station, name)
+        )
+    ''')
+
+# Moves the weather table of the main db into one SQLite file per partition and
+# records each partition in the catalog. Returns the number of partitions written.
+# The catalog only appears once every partition is written, so the API keeps
+# reading the single weather table until the switch.
+def partition_weather_table(conn, db_path, mode):
+    if mode not in PARTITION_MODES:
+        raise ValueError(f"Unknown partition mode: {mode}")
+
+    cur = conn.cursor()
+    drop_catalog_tables(cur, db_path)
+    conn.commit()
+
+    cur.execute(f'SELECT DISTINCT {PARTITION_KEY_SQL[mode]} FROM weather ORDER BY 1')
+    names = [row[0] for row in cur.fetchall()]
+
+    # Write the partition files, keeping their catalog entries until the end
+    partitions = []
+    for name in names:
+        path = partition_path(db_path, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+        cur.execute('ATTACH DATABASE ? AS part', [path])
+        cur.execute('''
+            CREATE TABLE part.weather (
+                station TEXT,
+                date DATE,
+                max_temp INTEGER,
+                min_temp INTEGER,
+                precipitation INTEGER,
+                PRIMARY KEY (station, date)
+            )
+        ''')
+        # Keep the single table's row order within each partition. Pages still differ
+        # for decade partitions, which return every station's 1980s rows before the 1990s.
+        where_clause, params = partition_filter(name, mode)
+        cur.execute(f'INSERT INTO part.weather SELECT * FROM weather WHERE {where_clause} ORDER BY rowid', params)
+        cur.execute('SELECT MIN(date), MAX(date), COUNT(*) FROM part.weather')
+        min_date, max_date, record_count = cur.fetchone()
+        cur.execute('SELECT DISTINCT station FROM part.weather')
+        stations = [row[0] for row in cur.fetchall()]
+        partitions.append((name, path, min_date, max_date, record_count, stations))
+        conn.commit()  # Can't detach inside an open transaction
+        cur.execute('DETACH DATABASE part')
+
+    # Switch to the partitioned layout in one transaction
+    cur.execute('BEGIN')
+    try:
+        create_catalog_tables(cur)
+        for name, path, min_date, max_date, record_count, stations in partitions:
+            cur.execute(
+                f'INSERT INTO {CATALOG_TABLE} (name, path, min_date, max_date, record_count) VALUES (?, ?, ?, ?, ?)',
+                (name, os.path.basename(path), min_date, max_date, record_count)
+            )
+            cur.executemany(
+                f'INSERT INTO {CATALOG_STATIONS_TABLE} (station, name) VALUES (?, ?)',
+                [(station, name) for station in stations]
+            )
+
+        # Only drop the weather table if every record made it into a partition
+        cur.execute('SELECT COUNT(*) FROM weather')
+        weather_count = cur.fetchone()[0]
+        cur.execute(f'SELECT COALESCE(SUM(record_count), 0) FROM {CATALOG_TABLE}')
+        partitioned_count = cur.fetchone()[0]
+        if partitioned_count != weather_count:
+            raise ValueError(
+                f"Partitions hold {partitioned_count} of {weather_count} weather records, "
+                "check for invalid dates or station IDs"
+            )
+
+        cur.execute('DROP TABLE weather')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        for partition in partitions:
+            os.remove(partition[1])
+        raise
+
+    conn.execute('VACUUM')
+    return len(names)
+
+# Returns the (name, path) partitions that can hold records matching the filters,
+# or None if the db uses the single weather table layout
+def find_partitions(conn, db_path, station=None, date=None):
+    cur = conn.cursor()
+    if not has_catalog(cur):
+        return None
+
+    where_clause = '1=1'
+    params = []
+
+    # Prune partitions by station and date range
+    if station:
+        where_clause += f' AND name IN (SELECT name FROM {CATALOG_STATIONS_TABLE} WHERE station = ?)'
+        params.append(station)
+
+    if date:
+        where_clause += ' AND min_date <= ? AND max_date >= ?'
+        params.extend([date, date])
+
+    cur.execute(f'SELECT name, path FROM {CATALOG_TABLE} WHERE {where_clause} ORDER BY min_date, name', params)
+    db_dir = os.path.dirname(os.path.abspath(db_path))
+    return [(row[0], os.path.join(db_dir, row[1])) for row in cur.fetchall()]
+
+# Runs a filtered, paginated weather query across partitions, in catalog order.
+# Returns (total_records, rows); rows are only fetched from partitions overlapping the page.
+# Raises MissingPartitionError rather than letting ATTACH create an empty file.
+def query_weather_partitions(conn, partitions, where_clause, params, limit, offset):
+    cur = conn.cursor()
+    total_records = 0
+    rows = []
+
+    for name, path in partitions:
+        if not os.path.isfile(path):
+            raise MissingPartitionError(f"Weather partition {name} is missing ({os.path.basename(path)})")
+        cur.execute('ATTACH DATABASE ? AS part', [path])
+        try:
+            cur.execute(f'SELECT COUNT(*) FROM part.weather WHERE {where_clause}', params)
+            count = cur.fetchone()[0]
+
+            # Rows still needed for the page, and where the page starts in this partition
+            remaining = limit - len(rows)
+            local_offset = max(offset - total_records, 0)
+            if remaining > 0 and local_offset < count:
+                cur.execute(
+                    f'SELECT * FROM part.weather WHERE {where_clause} LIMIT ? OFFSET ?',
+                    params + [remaining, local_offset]
+                )
+                rows.extend(cur.fetchall())
+            total_records += count
+        finally:
+            cur.execute('DETACH DATABASE part')
+
+    return total_records, rows
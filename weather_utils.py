@@ -1,6 +1,5 @@
 import os
 from pathlib import Path
-from tqdm import tqdm
 import time
 
 # Timer class and function
@@ -63,6 +62,7 @@ def load_weather_file(filepath, cursor):
 
 # Loads ALL txt weather files in a directory
 def load_all_weather_files(directory, cursor):
+    from tqdm import tqdm  # Imported here to keep module import fast
     for filename in tqdm(os.listdir(directory), desc="Processing station data files..."):
         filepath = os.path.join(directory, filename)
         if os.path.isfile(filepath) and filename.endswith('.txt'):